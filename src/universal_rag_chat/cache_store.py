@@ -0,0 +1,142 @@
+"""
+SQLite persistence for the Universal RAG Agent response caches.
+
+The exact-match and semantic caches live in memory; this store keeps a copy
+of their entries on disk so a restarted process starts with a warm cache
+instead of a 0% hit rate.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Writes are buffered and committed together to amortize fsync cost; a
+# partial batch is written at most FLUSH_INTERVAL seconds after its first row.
+WRITE_BATCH_SIZE = 50
+FLUSH_INTERVAL = 5.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS response_cache (
+    key BLOB PRIMARY KEY,
+    scope TEXT NOT NULL,
+    embedding BLOB,
+    response TEXT NOT NULL,
+    citations TEXT NOT NULL,
+    ts INTEGER NOT NULL
+)
+"""
+
+_UPSERT = """
+INSERT OR REPLACE INTO response_cache
+    (key, scope, embedding, response, citations, ts)
+VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+# A cached entry: exact-match key, semantic scope, query embedding, payload
+CacheRow = Tuple[bytes, str, Optional[np.ndarray], Dict[str, Any]]
+
+
+class CacheStore:
+    """Write-behind SQLite table of cached chat responses."""
+
+    def __init__(self, path: str):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        # Writes are flushed from worker threads; the lock serializes access
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._pending: List[Tuple[Any, ...]] = []
+        self._flush_timer: Optional[threading.Timer] = None
+        self._closed = False
+
+        with self._lock:
+            # WAL lets readers proceed during writes and makes commits cheaper
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute(_SCHEMA)
+            self._conn.commit()
+
+    def load(self, limit: int) -> List[CacheRow]:
+        """
+        Return the most recent entries, oldest first, and prune the rest.
+
+        Oldest-first order lets callers replay the rows into an LRU so the
+        newest entries end up as the most recently used ones.
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT key, scope, embedding, response, citations "
+                "FROM response_cache ORDER BY ts DESC LIMIT ?",
+                (limit,)).fetchall()
+            # Keep the table bounded to what a restart would load anyway
+            self._conn.execute(
+                "DELETE FROM response_cache WHERE key NOT IN ("
+                "SELECT key FROM response_cache ORDER BY ts DESC LIMIT ?)",
+                (limit,))
+            self._conn.commit()
+
+        entries = []
+        for key, scope, embedding, response, citations in reversed(rows):
+            vector = None
+            if embedding is not None:
+                vector = np.frombuffer(embedding, dtype=np.float32).copy()
+            entries.append((key, scope, vector, {
+                "response": response,
+                "citations": json.loads(citations)
+            }))
+        return entries
+
+    def add(self, key: bytes, scope: str, embedding: Optional[np.ndarray],
+            payload: Dict[str, Any]) -> bool:
+        """
+        Buffer an entry for the next write batch.
+
+        Returns True once WRITE_BATCH_SIZE entries are waiting, i.e. when the
+        caller should flush(). Smaller batches are flushed by a timer.
+        """
+        row = (
+            key,
+            scope,
+            embedding.astype(np.float32).tobytes()
+            if embedding is not None else None,
+            payload["response"],
+            json.dumps(payload["citations"]),
+            time.time_ns(),
+        )
+        with self._lock:
+            self._pending.append(row)
+            if len(self._pending) >= WRITE_BATCH_SIZE:
+                return True
+            if self._flush_timer is None and not self._closed:
+                self._flush_timer = threading.Timer(FLUSH_INTERVAL, self.flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+            return False
+
+    def _write_pending(self):
+        """Commit the buffered entries; the caller holds the lock."""
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+        rows, self._pending = self._pending, []
+        if rows:
+            self._conn.executemany(_UPSERT, rows)
+            self._conn.commit()
+
+    def flush(self):
+        """Write all buffered entries in a single transaction."""
+        with self._lock:
+            if not self._closed:
+                self._write_pending()
+
+    def close(self):
+        """Flush pending entries and close the database (idempotent)."""
+        with self._lock:
+            if self._closed:
+                return
+            self._write_pending()
+            self._closed = True
+            self._conn.close()
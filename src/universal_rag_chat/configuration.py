@@ -32,6 +32,40 @@ class Settings(BaseSettings):
     azure_tracing_content_recording: bool = os.getenv(
         "AZURE_TRACING_GEN_AI_CONTENT_RECORDING_ENABLED", "true").lower() == "true"
 
+    # Maximum number of agent runs in flight across all chat sessions
+    max_global_concurrency: int = int(
+        os.getenv("MAX_GLOBAL_CONCURRENCY", "20"))
+
+    # Worker threads for blocking Azure SDK calls
+    sdk_max_workers: int = int(os.getenv("SDK_MAX_WORKERS", "64"))
+
+    # Local record of the created agent, reused across restarts
+    agent_cache_path: str = os.getenv(
+        "AGENT_CACHE_PATH",
+        os.path.expanduser("~/.cache/universal_rag/agent.json"))
+
+    # Response cache settings
+    response_cache_enabled: bool = os.getenv(
+        "RESPONSE_CACHE_ENABLED", "true").lower() == "true"
+    response_cache_size: int = int(os.getenv("RESPONSE_CACHE_SIZE", "512"))
+
+    # Persist cached responses to SQLite so restarts begin with a warm cache
+    cache_persistence_enabled: bool = os.getenv(
+        "CACHE_PERSISTENCE_ENABLED", "true").lower() == "true"
+    cache_db_path: str = os.getenv(
+        "CACHE_DB_PATH",
+        os.path.expanduser("~/.cache/universal_rag/cache.db"))
+
+    # Semantic cache settings (requires an Azure OpenAI embedding deployment)
+    semantic_cache_enabled: bool = os.getenv(
+        "SEMANTIC_CACHE_ENABLED", "false").lower() == "true"
+    azure_openai_endpoint: str = os.getenv("AZURE_OPENAI_ENDPOINT", "")
+    embedding_deployment_name: str = os.getenv(
+        "EMBEDDING_DEPLOYMENT_NAME", "text-embedding-3-small")
+    semantic_cache_threshold: float = float(
+        os.getenv("SEMANTIC_CACHE_THRESHOLD", "0.05"))
+    semantic_cache_size: int = int(os.getenv("SEMANTIC_CACHE_SIZE", "512"))
+
     class Config:
         env_file = ".env"
         case_sensitive = False
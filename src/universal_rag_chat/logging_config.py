@@ -0,0 +1,45 @@
+"""
+Logging configuration for RAG CHAT AI Foundry.
+Importing this module configures logging once for the whole process.
+"""
+import logging
+import logging.config
+
+from configuration import settings
+
+LOGGING_CONFIG = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "formatters": {
+        "default": {
+            "format": "%(asctime)s [%(levelname)s] %(name)s: %(message)s"
+        }
+    },
+    "handlers": {
+        "console": {
+            "class": "logging.StreamHandler",
+            "formatter": "default"
+        }
+    },
+    "root": {
+        "level": settings.log_level,
+        "handlers": ["console"]
+    },
+    "loggers": {
+        # Reduce verbosity of Azure SDK request/response logs
+        "azure.core.pipeline.policies.http_logging_policy": {
+            "level": "WARNING"
+        }
+    }
+}
+
+# Only attach handlers once: later imports (or a host that already set up
+# logging, like chainlit's basicConfig at import) must not add a second
+# handler and double every log line.
+if not logging.getLogger().handlers:
+    logging.config.dictConfig(LOGGING_CONFIG)
+
+# Levels always apply, whoever installed the handlers
+logging.getLogger().setLevel(LOGGING_CONFIG["root"]["level"])
+for name, config in LOGGING_CONFIG["loggers"].items():
+    logging.getLogger(name).setLevel(config["level"])
@@ -2,25 +2,22 @@
 Main entrypoint for RAG CHAT AI Foundry Chainlit frontend.
 Starts Chainlit server and loads AI Agent Service agent.
 """
+import logging_config  # noqa: F401 - configures logging before other imports
+import asyncio
 import os
 import logging
 import chainlit as cl
 from rag_agent import UniversalRAGAgent
-import random
+from typing import List, Optional
 
 MODEL_NAME = os.getenv("MODEL_NAME", "universalragchat-gpt-4.1-mini")
 
+logger = logging.getLogger(__name__)
+
 agent = UniversalRAGAgent()
 
-# Configure root logger for the application
-logger = logging.getLogger("setlist_agent")
-logger.setLevel(logging.INFO)
-handler = logging.StreamHandler()
-formatter = logging.Formatter(
-    "%(asctime)s [%(levelname)s] %(name)s: %(message)s")
-handler.setFormatter(formatter)
-if not logger.hasHandlers():
-    logger.addHandler(handler)
+# Chat profiles built from the deployed models, cached for the process lifetime
+_chat_profiles: Optional[List[cl.ChatProfile]] = None
 
 
 @cl.on_chat_start
@@ -28,20 +25,29 @@ async def on_chat_start():
     """Initialize chat session with welcome message and authentication status."""
     logger.info("Chat session started.")
     chat_profile = cl.user_session.get("chat_profile")
-    logger.info(f"Chat profile: {chat_profile}")
+    logger.info("Chat profile: %s", chat_profile)
     await agent.initialize(model_name=chat_profile)
 
 
 @cl.set_chat_profiles
 async def chat_profile():
-    return [
-        cl.ChatProfile(
-            name=model['modelName'],
-            markdown_description=f"The underlying LLM model is **{model['modelName']}**.",
-            icon=f"https://picsum.photos/{random.randint(200, 250)}",
-        )
-        for model in await agent.available_models()
-    ]
+    """Return one chat profile per deployed model."""
+    global _chat_profiles
+    if _chat_profiles is None:
+        profiles = [
+            cl.ChatProfile(
+                name=model['modelName'],
+                markdown_description=f"The underlying LLM model is **{model['modelName']}**.",
+                # Seeded by model name so the browser can cache the icon
+                icon=f"https://picsum.photos/seed/{model['modelName']}/200",
+            )
+            for model in await agent.available_models()
+        ]
+        if not profiles:
+            # Listing failed; try again on the next render
+            return profiles
+        _chat_profiles = profiles
+    return _chat_profiles
 
 
 @cl.on_message
@@ -49,11 +55,34 @@ async def main(message: cl.Message):
     """
     Handles incoming messages from Chainlit frontend and routes to AI Agent Service.
     """
+    # Serialize the turns of a session so concurrent messages cannot race on
+    # the same thread; other sessions keep running concurrently.
+    sem = cl.user_session.get("sem")
+    if sem is None:
+        sem = asyncio.Semaphore(1)
+        cl.user_session.set("sem", sem)
+
     try:
-        thread_id = cl.user_session.get("thread_id", None)
-        response = await agent.chat(message.content, thread_id=thread_id)
-        logger.info(f"Response from agent: {response}")
-        await cl.Message(content=response['response']).send()
-        cl.user_session.set("thread_id", response['thread_id'])
+        async with sem:
+            thread_id = cl.user_session.get("thread_id", None)
+
+            # Stream tokens into the UI as soon as the agent produces them
+            msg = cl.Message(content="")
+            await msg.send()
+
+            response = None
+            async for event in agent.chat_stream(message.content, thread_id=thread_id):
+                if event['type'] == "delta":
+                    await msg.stream_token(event['delta'])
+                else:
+                    response = event
+
+            # Only serialize the full payload when debug logging is on
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Response from agent: %r", response)
+            if response['status'] == "error":
+                msg.content = response['response']
+            await msg.update()
+            cl.user_session.set("thread_id", response['thread_id'])
     except Exception as e:
         await cl.Message(content=f"Error: {str(e)}").send()
@@ -2,7 +2,9 @@
 AI Agent Service integration for RAG CHAT AI Foundry.
 Implements agent logic using provided model name.
 """
+from cache_store import CacheStore
 from configuration import settings, validate_required_settings
+from semantic_cache import SemanticCache
 from opentelemetry import trace
 from opentelemetry.instrumentation.asyncio import AsyncioInstrumentor
 from opentelemetry.instrumentation.fastapi import FastAPIInstrumentor
@@ -10,29 +12,214 @@ from opentelemetry.instrumentation.requests import RequestsInstrumentor
 from opentelemetry.instrumentation.httpx import HTTPXClientInstrumentor
 from azure.monitor.opentelemetry import configure_azure_monitor
 from azure.identity import DefaultAzureCredential, ManagedIdentityCredential
+from azure.identity import aio as identity_aio
+from azure.core.pipeline.transport import RequestsTransport
 
 from azure.ai.projects import AIProjectClient
-from typing import Dict, List, Optional, Any
+from azure.ai.agents.models import (
+    AgentStreamEvent, ListSortOrder, MessageDeltaChunk, ThreadMessageOptions)
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import AsyncIterator, Dict, Final, List, Optional, Any, Set, Tuple
 import logging
 import asyncio
+import atexit
+import contextvars
+import functools
+import hashlib
+import json
 import os
-from chainlit.logger import logger
+import time
 import httpx
+import requests
+from requests.adapters import HTTPAdapter
 
 
-# Configure logger for this module
-logger = logging.getLogger("setlistfm_agent")
-logger.setLevel(getattr(logging, settings.log_level))
-handler = logging.StreamHandler()
-formatter = logging.Formatter(
-    "%(asctime)s [%(levelname)s] %(name)s: %(message)s")
-handler.setFormatter(formatter)
-if not logger.hasHandlers():
-    logger.addHandler(handler)
+logger = logging.getLogger(__name__)
 
-# Optionally, reduce verbosity of Azure SDK logs
-logging.getLogger("azure.core.pipeline.policies.http_logging_policy").setLevel(
-    logging.WARNING)
+# Agent instructions; kept byte-identical so the system prompt (and its hash)
+# never changes between agent creations.
+_AGENT_INSTRUCTIONS: Final[str] = """
+        You are a helpful AI agent designed to assist users.
+        Your primary goal is to provide accurate and engaging responses based on the user's input.
+        Always strive to be helpful, accurate, and engaging.
+        """
+_AGENT_INSTRUCTIONS_HASH: Final[str] = hashlib.sha256(
+    _AGENT_INSTRUCTIONS.encode()).hexdigest()
+
+# Static part of every create_agent call
+_AGENT_TEMPLATE: Final[Dict[str, Any]] = {
+    "instructions": _AGENT_INSTRUCTIONS,
+    "tools": [],
+    "description": "Universal RAG Chat Agent",
+}
+
+# Delimiters of the retrieved-context block placed before the user query
+_DOCS_OPEN: Final[str] = "<docs>\n"
+_DOCS_CLOSE: Final[str] = "</docs>\n"
+
+# Marks the end of a streamed run on the event queue
+_STREAM_END = object()
+
+# Connection pool sizes shared by every client of the process: at most
+# MAX_CONNECTIONS per host, of which httpx keeps MAX_KEEPALIVE_CONNECTIONS
+# idle. requests keeps one pool per host and caches POOLED_HOSTS of them
+# (the project endpoint plus a few auth/management hosts).
+MAX_CONNECTIONS = 100
+MAX_KEEPALIVE_CONNECTIONS = 40
+POOLED_HOSTS = 4
+
+# How long the project deployment list is reused before being fetched again
+DEPLOYMENTS_CACHE_TTL = 300
+
+# Number of persisted cache entries replayed into memory at startup
+CACHE_LOAD_LIMIT = 10_000
+
+# Maximum number of thread IDs remembered as existing
+KNOWN_THREADS_CAPACITY = 10_000
+
+# Pooled transports, created once so TLS sessions are reused across calls.
+# The Azure SDK clients are synchronous and sit on top of requests; the
+# embedding calls of the semantic cache go through httpx (created on first
+# use, see _get_shared_http_client, so shutdown() can close it).
+_shared_session = requests.Session()
+_shared_session.mount("https://", HTTPAdapter(
+    pool_connections=POOLED_HOSTS, pool_maxsize=MAX_CONNECTIONS))
+_shared_transport = RequestsTransport(
+    session=_shared_session, session_owner=False)
+_shared_http_client: Optional[httpx.AsyncClient] = None
+
+# The Azure SDK clients are synchronous; their calls run on this pool so the
+# event loop stays free. It is larger than asyncio's default executor because
+# each concurrent chat session can hold a thread for a whole run.
+_sdk_executor = ThreadPoolExecutor(
+    max_workers=settings.sdk_max_workers, thread_name_prefix="azure-sdk")
+
+_credential = None
+_async_credential = None
+_project_client: Optional[AIProjectClient] = None
+
+
+def _pack_prompt(message: str,
+                 context: Optional[List[Dict[str, str]]] = None) -> str:
+    """
+    Build the user message content from the query and retrieved chunks.
+
+    Serving-side prompt (KV) caches only hit on an identical prefix, so the
+    context block is canonical: chunks are sorted by id and de-duplicated
+    (the same chunk is kept whatever the input order), separators are
+    fixed, nothing request-specific (timestamps, UUIDs) goes in, and the
+    user query is appended last.
+
+    Parameters:
+    message (str): The user query.
+    context (list): Retrieved chunks as {"id": ..., "content": ...} dicts.
+
+    Returns:
+    str: The message itself when there is no context, else the packed prompt.
+    """
+    if not context:
+        return message
+
+    chunks: Dict[str, str] = {}
+    for chunk in sorted(context, key=lambda c: (c["id"], c["content"])):
+        chunks.setdefault(chunk["id"], chunk["content"])
+    docs = "".join(
+        f'<doc id="{doc_id}">\n{content}\n</doc>\n'
+        for doc_id, content in chunks.items())
+    return f"{_DOCS_OPEN}{docs}{_DOCS_CLOSE}User: {message}"
+
+
+async def _run(sync_fn, *args, **kwargs):
+    """
+    Run a blocking SDK call on the SDK thread pool and await its result.
+
+    Like asyncio.to_thread, the current context is copied so the call stays
+    inside the active OpenTelemetry span.
+    """
+    loop = asyncio.get_running_loop()
+    context = contextvars.copy_context()
+    return await loop.run_in_executor(
+        _sdk_executor,
+        functools.partial(context.run, sync_fn, *args, **kwargs))
+
+
+def _get_credential():
+    """Return the process-wide Azure credential so tokens are shared."""
+    global _credential
+    if _credential is None:
+        if settings.azure_client_id:
+            _credential = ManagedIdentityCredential(
+                client_id=settings.azure_client_id)
+            logger.info("Using managed identity: %s", settings.azure_client_id)
+        else:
+            _credential = DefaultAzureCredential()
+            logger.info("Using default Azure credential")
+    return _credential
+
+
+def _get_async_credential():
+    """
+    Return the process-wide async Azure credential.
+
+    The Azure SDK clients are synchronous and need the sync credential
+    above; code running on the event loop (the semantic cache) uses this
+    one so token acquisition never blocks the loop.
+    """
+    global _async_credential
+    if _async_credential is None:
+        if settings.azure_client_id:
+            _async_credential = identity_aio.ManagedIdentityCredential(
+                client_id=settings.azure_client_id)
+        else:
+            _async_credential = identity_aio.DefaultAzureCredential()
+    return _async_credential
+
+
+def _get_shared_http_client() -> httpx.AsyncClient:
+    """Return the process-wide pooled httpx client for event-loop calls."""
+    global _shared_http_client
+    if _shared_http_client is None:
+        _shared_http_client = httpx.AsyncClient(
+            transport=httpx.AsyncHTTPTransport(
+                retries=2,
+                limits=httpx.Limits(
+                    max_connections=MAX_CONNECTIONS,
+                    max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS)),
+            timeout=10.0)
+    return _shared_http_client
+
+
+def _get_project_client() -> AIProjectClient:
+    """Return the process-wide AI Project Client on the pooled transport."""
+    global _project_client
+    if _project_client is None:
+        logger.info("Initializing AI Project Client")
+        _project_client = AIProjectClient(
+            endpoint=settings.project_endpoint,
+            credential=_get_credential(),
+            transport=_shared_transport
+        )
+    return _project_client
+
+
+def _close_project_client():
+    """Close the shared AI Project Client; the next use recreates it."""
+    global _project_client
+    if _project_client is not None:
+        _project_client.close()
+        _project_client = None
+
+
+async def _close_async_clients():
+    """Close the shared async credential and httpx client and their sessions."""
+    global _async_credential, _shared_http_client
+    if _async_credential is not None:
+        await _async_credential.close()
+        _async_credential = None
+    if _shared_http_client is not None:
+        await _shared_http_client.aclose()
+        _shared_http_client = None
 
 
 class UniversalRAGAgent:
@@ -43,6 +230,24 @@ class UniversalRAGAgent:
         self.agents_client = None
         self.agent_id: Optional[str] = None
         self._initialized = False
+        self._model_name: Optional[str] = None
+        self._init_lock = asyncio.Lock()
+        # Bounds concurrent agent runs across all sessions
+        self._run_semaphore = asyncio.Semaphore(settings.max_global_concurrency)
+
+        # Threads already validated or created, with FIFO eviction order
+        self._known_threads: Set[str] = set()
+        self._known_threads_order: deque = deque()
+
+        # (fetch time, deployments) from the last deployments.list() call
+        self._deployments_cache: Optional[
+            Tuple[float, List[Dict[str, Any]]]] = None
+        # modelName -> deployment name, rebuilt with the deployments cache
+        self._model_to_deployment: Dict[str, str] = {}
+
+        # In-process LRU of previous answers, keyed by model/thread/message
+        self._resp_cache: "OrderedDict[bytes, Dict[str, Any]]" = OrderedDict()
+        self._resp_cache_lock = asyncio.Lock()
 
         # Validate configuration
         validate_required_settings()
@@ -50,54 +255,117 @@ class UniversalRAGAgent:
         # Configure telemetry
         self._configure_telemetry()
 
-        # Set up Azure credentials
-        if settings.azure_client_id:
-            credential = ManagedIdentityCredential(
-                client_id=settings.azure_client_id)
-            logger.info(f"Using managed identity: {settings.azure_client_id}")
-        else:
-            credential = DefaultAzureCredential()
-            logger.info("Using default Azure credential")
-
-        logger.info("Initializing AI Project Client")
-        self.project_client = AIProjectClient(
-            endpoint=settings.project_endpoint,
-            credential=credential
-        )
+        self.project_client = _get_project_client()
         self.agents_client = self.project_client.agents
 
+        # Approximate cache for paraphrased messages, opt-in
+        self._semantic_cache: Optional[SemanticCache] = None
+        if settings.semantic_cache_enabled and settings.azure_openai_endpoint:
+            self._semantic_cache = SemanticCache(
+                endpoint=settings.azure_openai_endpoint,
+                deployment=settings.embedding_deployment_name,
+                credential=_get_async_credential(),
+                http_client=_get_shared_http_client(),
+                capacity=settings.semantic_cache_size,
+                threshold=settings.semantic_cache_threshold,
+            )
+
+        # On-disk copy of both caches so restarts begin warm
+        self._cache_store: Optional[CacheStore] = None
+        if settings.cache_persistence_enabled and (
+                settings.response_cache_enabled or self._semantic_cache):
+            self._load_persisted_cache()
+
+    def _load_persisted_cache(self):
+        """Open the cache database and replay its newest entries into memory."""
+        try:
+            self._cache_store = CacheStore(settings.cache_db_path)
+            entries = self._cache_store.load(CACHE_LOAD_LIMIT)
+            # Write out a partial batch even if shutdown() is never called
+            atexit.register(self._cache_store.close)
+        except Exception as e:
+            # A broken cache file must not prevent the agent from starting
+            logger.warning("Failed to load persisted response cache: %s", e)
+            return
+
+        for cache_key, scope, embedding, payload in entries:
+            if settings.response_cache_enabled:
+                self._resp_cache[cache_key] = payload
+                if len(self._resp_cache) > settings.response_cache_size:
+                    self._resp_cache.popitem(last=False)
+            if self._semantic_cache is not None and embedding is not None:
+                self._semantic_cache.store(scope, embedding, payload)
+        logger.info("Loaded %d persisted cache entries", len(entries))
+
     async def available_models(self) -> List[Dict[str, Any]]:
         """Retrieve all available models in the project."""
         if not self._initialized:
             await self.initialize()
 
         try:
-            models = []
-            for d in self.project_client.deployments.list():
-                logger.info(f"*** Found deployment: {d} ***")
-                models.append({
-                    "name": d.name,
-                    "modelPublisher": d['modelPublisher'],
-                    "modelName": d['modelName'],
-                    "modelVersion": d['modelVersion']
-                })
-            return models
+            return list(await self._deployments())
         except Exception as e:
-            logger.error(f"Failed to retrieve models: {e}")
+            logger.error("Failed to retrieve models: %s", e)
             return []
 
-    async def initialize(self, model_name: Optional[str] = None):
-        """Initialize the agent with Azure AI Foundry."""
+    async def _deployments(self) -> List[Dict[str, Any]]:
+        """
+        Return the project model deployments.
 
-        logger.info("Initializing Universal RAG Agent...")
-        self._selected_model = self._get_model_by_name(
-            model_name) or settings.model_deployment_name
+        The list is cached for DEPLOYMENTS_CACHE_TTL seconds so chat profile
+        renders and chat starts do not each hit the deployments REST API.
+        """
+        cache = self._deployments_cache
+        if cache and time.monotonic() - cache[0] < DEPLOYMENTS_CACHE_TTL:
+            return cache[1]
+
+        # The SDK pager is blocking; drain it off the event loop
+        deployments = await _run(
+            list, self.project_client.deployments.list())
+
+        models = []
+        for d in deployments:
+            logger.debug("*** Found deployment: %s ***", d)
+            models.append({
+                "name": d.name,
+                "modelPublisher": d['modelPublisher'],
+                "modelName": d['modelName'],
+                "modelVersion": d['modelVersion']
+            })
+        self._deployments_cache = (time.monotonic(), models)
+        # Keep the first deployment found for each model, as the scan did
+        self._model_to_deployment = {}
+        for model in models:
+            self._model_to_deployment.setdefault(
+                model['modelName'], model['name'])
+        return models
 
-        # Create the agent
-        await self._create_agent()
+    async def initialize(self, model_name: Optional[str] = None):
+        """
+        Initialize the agent with Azure AI Foundry.
 
-        self._initialized = True
-        logger.info("Universal RAG Agent initialized successfully")
+        Calling it again is a no-op unless a different model is requested,
+        so every chat start can call it without recreating the agent.
+        """
+        async with self._init_lock:
+            if self._initialized and model_name in (None, self._model_name):
+                logger.info("Universal RAG Agent already initialized")
+                return
+
+            logger.info("Initializing Universal RAG Agent...")
+            deployment = await self._get_model_by_name(model_name)
+            if model_name and not deployment:
+                # The model may have been deployed since the list was cached
+                self._deployments_cache = None
+                deployment = await self._get_model_by_name(model_name)
+            self._selected_model = deployment or settings.model_deployment_name
+
+            # Create the agent
+            await self._create_agent()
+
+            self._model_name = model_name
+            self._initialized = True
+            logger.info("Universal RAG Agent initialized successfully")
 
     def _configure_telemetry(self):
         """Configure Application Insights telemetry."""
@@ -136,114 +404,363 @@ class UniversalRAGAgent:
                     "No Application Insights connection string provided")
 
         except Exception as e:
-            logger.warning(f"Failed to configure telemetry: {e}")
+            logger.warning("Failed to configure telemetry: %s", e)
 
     async def _create_agent(self):
         """Create the AI agent with Bing Grounding tool."""
         logger.info("Creating AI agent ...")
 
+        # Reconnecting with the same model should not cost a delete + create
+        if await self._reuse_cached_agent(_AGENT_INSTRUCTIONS_HASH):
+            return
+
         try:
-            self._delete_agent()  # Clean up any existing agent
+            await self._delete_agent()  # Clean up any existing agent
             logger.info(
-                f"Create agent with enhanced instructions using model: {self._selected_model}")
-            agent = self.agents_client.create_agent(
+                "Create agent with enhanced instructions using model: %s",
+                self._selected_model)
+            agent = await _run(
+                self.agents_client.create_agent,
                 model=self._selected_model,
                 name=f"universal-chat-agent-{self._selected_model}",
-                instructions=self._get_agent_instructions(),
-                tools=[],
-                description="Universal RAG Chat Agent",
+                **_AGENT_TEMPLATE
             )
 
             self.agent_id = agent.id
-            logger.info(f"Created agent with ID: {self.agent_id}")
+            logger.info("Created agent with ID: %s", self.agent_id)
+            self._save_agent_record(_AGENT_INSTRUCTIONS_HASH)
 
         except Exception as e:
-            logger.error(f"Failed to create agent: {e}", exc_info=True)
+            logger.error("Failed to create agent: %s", e)
             raise
 
-    def _get_agent_instructions(self) -> str:
+    def _load_agent_records(self) -> Dict[str, Dict[str, str]]:
+        """Read the persisted agent records, keyed by project endpoint."""
+        try:
+            with open(settings.agent_cache_path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_agent_record(self, instructions_hash: str):
+        """Persist the current agent so a restart can reuse it."""
+        records = self._load_agent_records()
+        records[settings.project_endpoint] = {
+            "agent_id": self.agent_id,
+            "model": self._selected_model,
+            "instructions_hash": instructions_hash
+        }
+        self._write_agent_records(records)
+
+    def _forget_agent_record(self, agent_id: str):
+        """Drop the persisted record if it points at a deleted agent."""
+        records = self._load_agent_records()
+        record = records.get(settings.project_endpoint)
+        if record and record.get("agent_id") == agent_id:
+            del records[settings.project_endpoint]
+            self._write_agent_records(records)
+
+    @staticmethod
+    def _write_agent_records(records: Dict[str, Dict[str, str]]):
+        """Atomically replace the persisted agent records."""
+        try:
+            os.makedirs(os.path.dirname(settings.agent_cache_path) or ".",
+                        exist_ok=True)
+            # Write then rename so a crash never leaves a truncated file
+            tmp_path = f"{settings.agent_cache_path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(records, f)
+            os.replace(tmp_path, settings.agent_cache_path)
+        except OSError as e:
+            logger.warning("Failed to persist agent record: %s", e)
+
+    async def _reuse_cached_agent(self, instructions_hash: str) -> bool:
+        """
+        Reuse the persisted agent if it matches the model and instructions.
+
+        The record is only trusted after the service confirms the agent
+        still exists; returns True when the agent was reused.
+        """
+        record = self._load_agent_records().get(settings.project_endpoint)
+        if not record or record.get("model") != self._selected_model \
+                or record.get("instructions_hash") != instructions_hash:
+            return False
+
+        try:
+            agent = await _run(
+                self.agents_client.get_agent, record["agent_id"])
+        except Exception as e:
+            logger.info("Cached agent %s unavailable: %s",
+                        record['agent_id'], e)
+            return False
+
+        self.agent_id = agent.id
+        logger.info("Reusing existing agent with ID: %s", self.agent_id)
+        return True
+
+    @staticmethod
+    def _get_agent_instructions() -> str:
         """Get agent instructions for setlist content management."""
-        return """
-        You are a helpful AI agent designed to assist users.
-        Your primary goal is to provide accurate and engaging responses based on the user's input.
-        Always strive to be helpful, accurate, and engaging.
+        return _AGENT_INSTRUCTIONS
+
+    def _response_cache_key(self, message: str) -> bytes:
+        """Build the exact-match cache key for a first-turn message."""
+        raw = f"{self._selected_model}|{message}"
+        return hashlib.blake2b(raw.encode(), digest_size=16).digest()
+
+    def _semantic_cache_scope(self) -> str:
         """
+        Semantic hits are only shared between first turns of the same model.
 
-    async def chat(self, message: str, thread_id: Optional[str] = None) -> Dict[str, Any]:
-        """Process a chat message and return agent response."""
-        if not self._initialized:
-            await self.initialize()
+        Turns inside a thread are never embedded: they could not match again
+        and would only cost an embeddings call and evict first-turn entries.
+        """
+        return self._selected_model
 
-        tracer = trace.get_tracer(__name__)
+    async def _lookup_cached_response(
+        self, message: str, thread_id: Optional[str]
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        """
+        Look up a message in the exact then the semantic cache.
 
-        with tracer.start_as_current_span("universal_agent_chat") as span:
-            span.set_attribute("message_length", len(message))
+        Only first turns (no thread yet) are cached: inside a thread the
+        answer depends on the conversation so far, and such an entry could
+        never be hit again.
 
+        Returns the cached payload (or None) along with a cache entry
+        (exact-match key, semantic scope and query embedding) so a miss can
+        be stored without recomputing; the entry is None when the turn is
+        not cacheable or every cache is disabled.
+        """
+        if thread_id or not (settings.response_cache_enabled
+                             or self._semantic_cache or self._cache_store):
+            return None, None
+
+        # The key also identifies the entry in the persisted cache
+        entry = {
+            "key": self._response_cache_key(message),
+            "scope": self._semantic_cache_scope(),
+            "embedding": None
+        }
+
+        if settings.response_cache_enabled:
+            cached = self._resp_cache.get(entry["key"])
+            if cached is not None:
+                self._resp_cache.move_to_end(entry["key"])
+                return cached, entry
+
+        # Empty text (e.g. an attachment-only message) cannot be embedded
+        if self._semantic_cache is not None and message.strip():
             try:
-                logger.info(f"Processing chat message: {message[:100]}...")
+                entry["embedding"] = await self._semantic_cache.embed(message)
+                cached = self._semantic_cache.lookup(
+                    entry["scope"], entry["embedding"])
+                if cached is not None:
+                    return cached, entry
+            except Exception as e:
+                # The cache is an optimization; never fail the chat for it
+                logger.warning("Semantic cache lookup failed: %s", e)
+
+        return None, entry
 
-                # Create or use existing thread
-                if thread_id:
-                    thread = self.agents_client.threads.get(
-                        thread_id=thread_id)
-                else:
-                    thread = self.agents_client.threads.create()
-                    thread_id = thread.id
+    async def _cache_response(self, entry: Optional[Dict[str, Any]],
+                              payload: Dict[str, Any]):
+        """Store a payload in the response caches, evicting the LRU entry."""
+        if entry is None:
+            return
 
-                span.set_attribute("thread_id", thread_id)
+        if settings.response_cache_enabled:
+            async with self._resp_cache_lock:
+                self._resp_cache[entry["key"]] = payload
+                self._resp_cache.move_to_end(entry["key"])
+                if len(self._resp_cache) > settings.response_cache_size:
+                    self._resp_cache.popitem(last=False)
 
-                # Add user message to thread
-                user_message = self.agents_client.messages.create(
+        embedding = entry["embedding"]
+        if self._semantic_cache is not None and embedding is not None:
+            try:
+                self._semantic_cache.store(entry["scope"], embedding, payload)
+            except Exception as e:
+                logger.warning("Semantic cache store failed: %s", e)
+
+        if self._cache_store is not None:
+            try:
+                if self._cache_store.add(
+                        entry["key"], entry["scope"], embedding, payload):
+                    await _run(self._cache_store.flush)
+            except Exception as e:
+                logger.warning("Failed to persist cached response: %s", e)
+
+    async def _record_cached_turn(self, message: str, response: str) -> str:
+        """
+        Create the thread of a first turn answered from the cache.
+
+        No run is made, but the user message and the cached answer are still
+        posted so the thread history matches what the user saw and later
+        turns keep their context. Returns the new thread ID.
+        """
+        thread = await _run(
+            self.agents_client.threads.create,
+            messages=[
+                ThreadMessageOptions(role="user", content=message),
+                ThreadMessageOptions(role="assistant", content=response)
+            ]
+        )
+        self._remember_thread(thread.id)
+        return thread.id
+
+    async def _prepare_thread(self, message: str, thread_id: Optional[str]) -> str:
+        """
+        Create or reuse a thread, add the user message and return its ID.
+
+        The SDK calls are blocking, so they run in worker threads to keep the
+        Chainlit event loop free for other sessions.
+        """
+        if thread_id in self._known_threads:
+            # Already validated: only the message needs to be posted
+            await _run(
+                self.agents_client.messages.create,
+                thread_id=thread_id,
+                role="user",
+                content=message
+            )
+            return thread_id
+
+        if thread_id:
+            # Validating the thread and posting the message are independent
+            # calls, so they are issued concurrently.
+            await asyncio.gather(
+                _run(
+                    self.agents_client.threads.get, thread_id=thread_id),
+                _run(
+                    self.agents_client.messages.create,
                     thread_id=thread_id,
                     role="user",
                     content=message
                 )
+            )
+            self._remember_thread(thread_id)
+            return thread_id
 
-                # Create and process agent run
-                run = self.agents_client.runs.create_and_process(
-                    thread_id=thread_id,
-                    agent_id=self.agent_id
-                )
+        # A new thread is created with the user message in a single call
+        thread = await _run(
+            self.agents_client.threads.create,
+            messages=[ThreadMessageOptions(role="user", content=message)]
+        )
+        self._remember_thread(thread.id)
+        return thread.id
 
-                span.set_attribute("run_status", run.status)
+    def _remember_thread(self, thread_id: str):
+        """Record a thread as existing, forgetting the oldest one when full."""
+        if thread_id in self._known_threads:
+            return
+        self._known_threads.add(thread_id)
+        self._known_threads_order.append(thread_id)
+        if len(self._known_threads_order) > KNOWN_THREADS_CAPACITY:
+            self._known_threads.discard(self._known_threads_order.popleft())
+
+    def _get_run_message(self, thread_id: str, run_id: str):
+        """Return the newest message produced by a run, or None."""
+        # Only the newest message of this run is needed: fetch a single item
+        # instead of walking the whole thread history.
+        return next(iter(self.agents_client.messages.list(
+            thread_id=thread_id,
+            run_id=run_id,
+            order=ListSortOrder.DESCENDING,
+            limit=1
+        )), None)
+
+    @staticmethod
+    def _extract_citations(msg) -> List[Dict[str, str]]:
+        """Collect URL citations attached to an assistant message."""
+        return [
+            {
+                "title": annotation.url_citation.title,
+                "url": annotation.url_citation.url
+            }
+            for annotation in msg.url_citation_annotations
+        ]
+
+    async def chat(self, message: str, thread_id: Optional[str] = None,
+                   context: Optional[List[Dict[str, str]]] = None) -> Dict[str, Any]:
+        """
+        Process a chat message and return agent response.
 
-                if run.status == "failed":
-                    error_msg = f"Agent run failed: {run.last_error}"
-                    logger.error(error_msg)
-                    span.set_attribute("error", error_msg)
+        Optional retrieved context chunks are packed ahead of the message.
+        """
+        if not self._initialized:
+            await self.initialize()
+
+        tracer = trace.get_tracer(__name__)
+
+        with tracer.start_as_current_span("universal_agent_chat") as span:
+            span.set_attribute("message_length", len(message))
+
+            try:
+                prompt = _pack_prompt(message, context)
+
+                # Identical or paraphrased questions are answered from the
+                # cache, skipping the agent run and its token cost.
+                cached, cache_entry = await self._lookup_cached_response(
+                    prompt, thread_id)
+                span.set_attribute("cache_hit", cached is not None)
+                if cached is not None:
+                    logger.info("Serving chat response from cache")
+                    thread_id = await self._record_cached_turn(
+                        prompt, cached["response"])
+                    span.set_attribute("thread_id", thread_id)
                     return {
                         "thread_id": thread_id,
-                        "response": "I encountered an error processing your request. Please try again.",
-                        "status": "error"
+                        "response": cached["response"],
+                        "citations": list(cached["citations"]),
+                        "status": "success"
                     }
 
-                # Get agent response
-                messages = self.agents_client.messages.list(
-                    thread_id=thread_id)
+                logger.info("Processing chat message: %.100s...", message)
+
+                # Cap the number of runs in flight against the agent service
+                async with self._run_semaphore:
+                    thread_id = await self._prepare_thread(prompt, thread_id)
+                    span.set_attribute("thread_id", thread_id)
+
+                    # Create and process agent run
+                    run = await _run(
+                        self.agents_client.runs.create_and_process,
+                        thread_id=thread_id,
+                        agent_id=self.agent_id
+                    )
+
+                    span.set_attribute("run_status", run.status)
+
+                    if run.status == "failed":
+                        error_msg = f"Agent run failed: {run.last_error}"
+                        logger.error(error_msg)
+                        span.set_attribute("error", error_msg)
+                        return {
+                            "thread_id": thread_id,
+                            "response": "I encountered an error processing your request. Please try again.",
+                            "status": "error"
+                        }
+
+                    msg = await _run(
+                        self._get_run_message, thread_id, run.id)
 
-                # Find the latest assistant message
                 response_content = ""
                 citations = []
-
-                for msg in messages:
-                    if msg.role == "assistant":
-                        if msg.text_messages:
-                            for text_msg in msg.text_messages:
-                                response_content = text_msg.text.value
-                                break
-                        break
-
-                # Collect citations if available
-                for msg in messages:
-                    if msg.role == "assistant":
-                        for annotation in msg.url_citation_annotations:
-                            citations.append({
-                                "title": annotation.url_citation.title,
-                                "url": annotation.url_citation.url
-                            })
+                if msg is not None and msg.role == "assistant":
+                    if msg.text_messages:
+                        response_content = msg.text_messages[0].text.value
+                    citations = self._extract_citations(msg)
 
                 logger.info(
-                    f"Generated response with {len(citations)} citations")
+                    "Generated response with %d citations", len(citations))
+
+                if response_content:
+                    # Only stored for first turns, see _lookup_cached_response
+                    await self._cache_response(cache_entry, {
+                        "response": response_content,
+                        "citations": citations
+                    })
 
                 return {
                     "thread_id": thread_id,
@@ -263,65 +780,214 @@ class UniversalRAGAgent:
                     "status": "error"
                 }
 
+    def _stream_run(self, thread_id: str, loop: asyncio.AbstractEventLoop,
+                    queue: asyncio.Queue):
+        """
+        Drive a streaming agent run and forward its events to the event loop.
+
+        The agents SDK stream is a blocking iterator, so it runs in a worker
+        thread and hands each (event_type, event_data) pair over to the queue.
+        """
+        try:
+            with self.agents_client.runs.stream(
+                thread_id=thread_id,
+                agent_id=self.agent_id
+            ) as stream:
+                for event_type, event_data, _ in stream:
+                    loop.call_soon_threadsafe(
+                        queue.put_nowait, (event_type, event_data))
+        except Exception as e:
+            loop.call_soon_threadsafe(queue.put_nowait, e)
+        finally:
+            loop.call_soon_threadsafe(queue.put_nowait, _STREAM_END)
+
+    async def chat_stream(
+        self, message: str, thread_id: Optional[str] = None,
+        context: Optional[List[Dict[str, str]]] = None
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Process a chat message and stream the agent response.
+
+        Optional retrieved context chunks are packed ahead of the message, as
+        in chat().
+
+        Yields {"type": "delta", "delta": str} events as tokens arrive, then a
+        final {"type": "done", ...} event carrying the same thread_id,
+        response, citations and status fields as chat().
+        """
+        if not self._initialized:
+            await self.initialize()
+
+        tracer = trace.get_tracer(__name__)
+
+        with tracer.start_as_current_span("universal_agent_chat_stream") as span:
+            span.set_attribute("message_length", len(message))
+
+            try:
+                prompt = _pack_prompt(message, context)
+                cached, cache_entry = await self._lookup_cached_response(
+                    prompt, thread_id)
+                span.set_attribute("cache_hit", cached is not None)
+                if cached is not None:
+                    logger.info("Serving chat response from cache")
+                    thread_id = await self._record_cached_turn(
+                        prompt, cached["response"])
+                    span.set_attribute("thread_id", thread_id)
+                    yield {"type": "delta", "delta": cached["response"]}
+                    yield {
+                        "type": "done",
+                        "thread_id": thread_id,
+                        "response": cached["response"],
+                        "citations": list(cached["citations"]),
+                        "status": "success"
+                    }
+                    return
+
+                logger.info("Streaming chat message: %.100s...", message)
+
+                # Cap the number of runs in flight against the agent service
+                async with self._run_semaphore:
+                    thread_id = await self._prepare_thread(prompt, thread_id)
+                    span.set_attribute("thread_id", thread_id)
+
+                    loop = asyncio.get_running_loop()
+                    queue: asyncio.Queue = asyncio.Queue()
+                    worker = asyncio.create_task(_run(
+                        self._stream_run, thread_id, loop, queue))
+
+                    deltas = []
+                    final_message = None
+                    run_error = None
+                    while True:
+                        item = await queue.get()
+                        if item is _STREAM_END:
+                            break
+                        if isinstance(item, Exception):
+                            raise item
+
+                        event_type, event_data = item
+                        if isinstance(event_data, MessageDeltaChunk):
+                            if event_data.text:
+                                deltas.append(event_data.text)
+                                yield {"type": "delta", "delta": event_data.text}
+                        elif event_type == AgentStreamEvent.THREAD_MESSAGE_COMPLETED:
+                            final_message = event_data
+                        elif event_type == AgentStreamEvent.THREAD_RUN_FAILED:
+                            run_error = event_data.last_error
+                        elif event_type == AgentStreamEvent.ERROR:
+                            run_error = event_data
+
+                    await worker
+
+                if run_error is not None:
+                    error_msg = f"Agent run failed: {run_error}"
+                    logger.error(error_msg)
+                    span.set_attribute("error", error_msg)
+                    yield {
+                        "type": "done",
+                        "thread_id": thread_id,
+                        "response": "I encountered an error processing your request. Please try again.",
+                        "status": "error"
+                    }
+                    return
+
+                # The terminal message holds the full text and its citations
+                response_content = "".join(deltas)
+                citations = []
+                if final_message is not None:
+                    if final_message.text_messages:
+                        response_content = final_message.text_messages[0].text.value
+                    citations = self._extract_citations(final_message)
+
+                logger.info(
+                    "Streamed response with %d citations", len(citations))
+
+                if response_content:
+                    await self._cache_response(cache_entry, {
+                        "response": response_content,
+                        "citations": citations
+                    })
+
+                yield {
+                    "type": "done",
+                    "thread_id": thread_id,
+                    "response": response_content,
+                    "citations": citations,
+                    "status": "success"
+                }
+
+            except Exception as e:
+                error_msg = f"Error in chat streaming: {e}"
+                logger.error(error_msg)
+                span.set_attribute("error", error_msg)
+
+                yield {
+                    "type": "done",
+                    "thread_id": thread_id,
+                    "response": "I encountered an error processing your request. Please try again later.",
+                    "status": "error"
+                }
+
     async def get_thread_history(self, thread_id: str) -> List[Dict[str, Any]]:
         """Get chat history for a specific thread."""
         if not self._initialized:
             await self.initialize()
 
         try:
-            messages = self.agents_client.messages.list(thread_id=thread_id)
-
-            history = []
-            for msg in messages:
-                content = ""
-                if msg.text_messages:
-                    for text_msg in msg.text_messages:
-                        content = text_msg.text.value
-                        break
-
-                history.append({
+            # Ask the service for chronological order instead of reversing
+            # the whole history locally.
+            messages = await _run(
+                list, self.agents_client.messages.list(
+                    thread_id=thread_id, order=ListSortOrder.ASCENDING))
+
+            return [
+                {
                     "role": msg.role,
-                    "content": content,
+                    "content": msg.text_messages[0].text.value if msg.text_messages else "",
                     "timestamp": msg.created_at
-                })
-
-            # Reverse to get chronological order
-            return list(reversed(history))
+                }
+                for msg in messages
+            ]
 
         except Exception as e:
-            logger.error(f"Error getting thread history: {e}")
+            logger.error("Error getting thread history: %s", e)
             return []
 
-    def _get_model_by_name(self, model_name: Optional[str]) -> Optional[str]:
+    async def _get_model_by_name(self, model_name: Optional[str]) -> Optional[str]:
         """
         Retrieve the deployment name for a given model name.
         Returns the deployment name if found, otherwise None.
         """
-        logger.info(f"Retrieving model by name: {model_name}")
+        logger.info("Retrieving model by name: %s", model_name)
         if not model_name:
             return None
         try:
-            for d in self.project_client.deployments.list():
-                if d['modelName'] == model_name:
-                    logger.info(f"Found model: {d['name']}")
-                    return d['name']
+            await self._deployments()
         except Exception as e:
             logger.error(
-                f"Error retrieving model by name: {e}, returning None")
-        return None
+                "Error retrieving model by name: %s, returning None", e)
+            return None
+
+        deployment = self._model_to_deployment.get(model_name)
+        if deployment:
+            logger.info("Found model: %s", deployment)
+        return deployment
 
-    def _delete_agent(self):
+    async def _delete_agent(self):
         """Delete the agent if it exists."""
         if not self.agent_id:
             logger.warning("No agent ID set, skipping deletion")
             return
 
         try:
-            logger.info(f"Deleting agent with ID: {self.agent_id}")
-            self.agents_client.delete_agent(self.agent_id)
+            logger.info("Deleting agent with ID: %s", self.agent_id)
+            await _run(
+                self.agents_client.delete_agent, self.agent_id)
             logger.info("Agent deleted successfully")
+            # Otherwise the next start would try the deleted agent first
+            self._forget_agent_record(self.agent_id)
         except Exception as e:
-            logger.error(f"Failed to delete agent: {e}", exc_info=True)
+            logger.warning("Failed to delete agent: %s", e)
 
     async def shutdown(self):
         """Clean up resources."""
@@ -329,14 +995,27 @@ class UniversalRAGAgent:
 
         try:
             # Delete the agent
-            self._delete_agent()
+            await self._delete_agent()
+
+            if self._semantic_cache:
+                await self._semantic_cache.close()
+                self._semantic_cache = None
+
+            # Write out any buffered cache entries
+            if self._cache_store:
+                await _run(self._cache_store.close)
+                self._cache_store = None
 
             # Close project client
             if self.project_client:
-                self.project_client.close()
+                _close_project_client()
+                self.project_client = None
+
+            # Close the aiohttp/httpx sessions held by the async clients
+            await _close_async_clients()
 
             self._initialized = False
             logger.info("SetlistFM Agent shutdown complete")
 
         except Exception as e:
-            logger.error(f"Error during shutdown: {e}")
+            logger.error("Error during shutdown: %s", e)
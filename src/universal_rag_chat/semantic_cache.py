@@ -0,0 +1,215 @@
+"""
+Semantic (approximate) response cache for the Universal RAG Agent.
+
+Paraphrased questions ("Bonjour!" vs "bonjour !") map to nearby embeddings,
+so a previous answer can be reused when the cosine distance between the new
+query and a cached query is below a threshold. This follows the Proximity
+approach: look up the nearest cached key, return its value on a close enough
+match, otherwise let the caller compute the answer and insert it, evicting
+the least recently used entry when the cache is full.
+"""
+import asyncio
+import hashlib
+import time
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+import httpx
+import numpy as np
+from azure.core.credentials_async import AsyncTokenCredential
+
+# Token scope for Azure OpenAI data-plane calls
+COGNITIVE_SERVICES_SCOPE = "https://cognitiveservices.azure.com/.default"
+EMBEDDINGS_API_VERSION = "2024-10-21"
+
+# Refresh the bearer token this many seconds before it expires
+TOKEN_REFRESH_MARGIN = 300
+
+# Concurrent embed() calls are coalesced into one request of at most
+# EMBED_BATCH_SIZE inputs, waiting at most EMBED_BATCH_TIMEOUT seconds.
+EMBED_BATCH_SIZE = 32
+EMBED_BATCH_TIMEOUT = 0.02
+
+
+def _scope_id(scope: str) -> int:
+    """Hash a cache scope string into a stable signed 64-bit integer."""
+    digest = hashlib.blake2b(scope.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, "little", signed=True)
+
+
+class SemanticCache:
+    """Embedding-similarity cache of chat responses."""
+
+    def __init__(self, endpoint: str, deployment: str,
+                 credential: AsyncTokenCredential,
+                 http_client: Optional[httpx.AsyncClient] = None,
+                 capacity: int = 512, threshold: float = 0.05):
+        self._embeddings_url = (
+            f"{endpoint.rstrip('/')}/openai/deployments/{deployment}"
+            f"/embeddings?api-version={EMBEDDINGS_API_VERSION}")
+        self._credential = credential
+        self._token = None
+        # Reuse the caller's pooled client when given, otherwise own one
+        self._owns_http_client = http_client is None
+        self._http_client = http_client or httpx.AsyncClient(timeout=10.0)
+
+        # Texts waiting for the next embedding batch and the flush timer
+        self._pending: List[Tuple[str, asyncio.Future]] = []
+        self._flush_timer: Optional[asyncio.TimerHandle] = None
+        self._batch_tasks: Set[asyncio.Task] = set()
+
+        self._capacity = capacity
+        self._threshold = threshold
+
+        # Parallel arrays: normalized query embeddings, their scope and the
+        # tick at which they were last used (for LRU eviction).
+        self._keys: Optional[np.ndarray] = None
+        self._scopes = np.zeros(capacity, dtype=np.int64)
+        self._last_used = np.zeros(capacity, dtype=np.int64)
+        self._vals: List[Optional[Dict[str, Any]]] = [None] * capacity
+        self._size = 0
+        self._tick = 0
+
+    async def _get_token(self) -> str:
+        """Return a cached bearer token, refreshing it shortly before expiry."""
+        if self._token is None or \
+                self._token.expires_on - TOKEN_REFRESH_MARGIN < time.time():
+            self._token = await self._credential.get_token(
+                COGNITIVE_SERVICES_SCOPE)
+        return self._token.token
+
+    async def _embed_texts(self, texts: List[str]) -> np.ndarray:
+        """Embed several texts in one request; returns unit-norm rows."""
+        token = await self._get_token()
+        response = await self._http_client.post(
+            self._embeddings_url,
+            headers={"Authorization": f"Bearer {token}"},
+            json={"input": texts},
+        )
+        response.raise_for_status()
+        data = sorted(response.json()["data"], key=lambda d: d["index"])
+        vectors = np.asarray([d["embedding"] for d in data], dtype=np.float32)
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors
+
+    def _flush(self):
+        """Send all pending texts as one embedding batch."""
+        if self._flush_timer is not None:
+            self._flush_timer.cancel()
+            self._flush_timer = None
+
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.create_task(self._run_batch(batch))
+            # Keep a reference so the task is not garbage collected
+            self._batch_tasks.add(task)
+            task.add_done_callback(self._batch_tasks.discard)
+
+    async def _embed_one(self, text: str, future: asyncio.Future):
+        """Embed a single text and resolve its caller's future."""
+        try:
+            vector = (await self._embed_texts([text]))[0]
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+            return
+        if not future.done():
+            future.set_result(vector)
+
+    async def _run_batch(self, batch: List[Tuple[str, asyncio.Future]]):
+        """Embed a batch and scatter the vectors (or the error) to callers."""
+        try:
+            vectors = await self._embed_texts([text for text, _ in batch])
+        except httpx.HTTPStatusError as e:
+            if len(batch) > 1 and 400 <= e.response.status_code < 500:
+                # One bad input (e.g. too long) rejects the whole request:
+                # retry the items one by one so only that caller fails.
+                await asyncio.gather(
+                    *(self._embed_one(text, future) for text, future in batch))
+                return
+            self._fail_batch(batch, e)
+            return
+        except Exception as e:
+            self._fail_batch(batch, e)
+            return
+
+        for (_, future), vector in zip(batch, vectors):
+            if not future.done():
+                future.set_result(vector)
+
+    @staticmethod
+    def _fail_batch(batch: List[Tuple[str, asyncio.Future]], error: Exception):
+        """Propagate a batch-wide error to every waiting caller."""
+        for _, future in batch:
+            if not future.done():
+                future.set_exception(error)
+
+    async def embed(self, text: str) -> np.ndarray:
+        """
+        Embed a text and return it as a unit-norm float32 vector.
+
+        Calls made within the same short window (e.g. several sessions
+        chatting at once) share a single embeddings request.
+        """
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((text, future))
+
+        if len(self._pending) >= EMBED_BATCH_SIZE:
+            self._flush()
+        elif self._flush_timer is None:
+            self._flush_timer = loop.call_later(
+                EMBED_BATCH_TIMEOUT, self._flush)
+
+        return await future
+
+    def lookup(self, scope: str, embedding: np.ndarray) -> Optional[Dict[str, Any]]:
+        """
+        Return the cached payload whose key is closest to the embedding.
+
+        Only entries stored under the same scope are considered, and only a
+        match with cosine distance <= threshold counts as a hit.
+        """
+        if self._size == 0 or self._keys.shape[1] != embedding.shape[0]:
+            return None
+
+        # Keys are unit vectors, so the dot product is the cosine similarity
+        sims = self._keys[:self._size] @ embedding
+        sims[self._scopes[:self._size] != _scope_id(scope)] = -np.inf
+        best = int(np.argmax(sims))
+        if sims[best] < 1.0 - self._threshold:
+            return None
+
+        self._tick += 1
+        self._last_used[best] = self._tick
+        return self._vals[best]
+
+    def store(self, scope: str, embedding: np.ndarray, payload: Dict[str, Any]):
+        """
+        Insert a payload, replacing the least recently used entry if full.
+
+        An embedding of another dimension (the embedding model changed, e.g.
+        since the entries were persisted) clears the cache: the latest model
+        wins and entries it cannot be compared with are dropped.
+        """
+        if self._keys is None or self._keys.shape[1] != embedding.shape[0]:
+            self._keys = np.zeros(
+                (self._capacity, embedding.shape[0]), dtype=np.float32)
+            self._vals = [None] * self._capacity
+            self._size = 0
+
+        if self._size < self._capacity:
+            slot = self._size
+            self._size += 1
+        else:
+            slot = int(np.argmin(self._last_used))
+
+        self._tick += 1
+        self._keys[slot] = embedding
+        self._scopes[slot] = _scope_id(scope)
+        self._last_used[slot] = self._tick
+        self._vals[slot] = payload
+
+    async def close(self):
+        """Close the underlying HTTP client if this cache created it."""
+        if self._owns_http_client:
+            await self._http_client.aclose()
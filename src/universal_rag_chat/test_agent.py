@@ -1,6 +1,7 @@
 """
 Test script for SetlistFM Agent
 """
+import logging_config  # noqa: F401 - configures logging before other imports
 from configuration import settings
 from rag_agent import UniversalRAGAgent
 import asyncio
@@ -0,0 +1,94 @@
+"""
+Unit tests for the SQLite persistence of the response caches
+"""
+import time
+
+import numpy as np
+
+import cache_store
+from cache_store import CacheStore
+
+PAYLOAD = {"response": "Bonjour !", "citations": ["doc-1", "doc-2"]}
+
+
+def _load_rows(path: str, limit: int = 10):
+    """Read rows through a separate, closed-after-use store."""
+    reader = CacheStore(path)
+    try:
+        return reader.load(limit=limit)
+    finally:
+        reader.close()
+
+
+def test_round_trip(tmp_path):
+    """Keys, scopes, embeddings and payloads survive a reopen."""
+    path = str(tmp_path / "cache.db")
+    embedding = np.asarray([0.6, 0.8], dtype=np.float32)
+
+    store = CacheStore(path)
+    store.add(b"key-1", "model|", embedding, PAYLOAD)
+    store.add(b"key-2", "model|thread|msg", None, {"response": "x",
+                                                   "citations": []})
+    store.close()
+
+    entries = _load_rows(path)
+
+    assert [entry[0] for entry in entries] == [b"key-1", b"key-2"]
+    key, scope, vector, payload = entries[0]
+    assert scope == "model|"
+    np.testing.assert_array_equal(vector, embedding)
+    assert payload == PAYLOAD
+    assert entries[1][2] is None
+
+
+def test_load_returns_newest_oldest_first_and_prunes(tmp_path):
+    """load() keeps the newest rows, oldest first, and deletes the rest."""
+    path = str(tmp_path / "cache.db")
+    store = CacheStore(path)
+    for i in range(5):
+        store.add(bytes([i]), "s", None, PAYLOAD)
+    store.flush()
+
+    assert [entry[0] for entry in store.load(limit=3)] == \
+        [bytes([2]), bytes([3]), bytes([4])]
+    # Rows beyond the limit were deleted
+    assert len(store.load(limit=10)) == 3
+    store.close()
+
+
+def test_add_requests_flush_at_batch_size(tmp_path):
+    """add() asks for a flush once a full batch is buffered."""
+    store = CacheStore(str(tmp_path / "cache.db"))
+    results = [store.add(bytes([i]), "s", None, PAYLOAD)
+               for i in range(cache_store.WRITE_BATCH_SIZE)]
+
+    assert results[-1] is True
+    assert not any(results[:-1])
+    store.close()
+
+
+def test_partial_batch_is_flushed_by_timer(tmp_path, monkeypatch):
+    """A partial batch is written after FLUSH_INTERVAL seconds."""
+    monkeypatch.setattr(cache_store, "FLUSH_INTERVAL", 0.05)
+    path = str(tmp_path / "cache.db")
+    store = CacheStore(path)
+    store.add(b"key", "s", None, PAYLOAD)
+
+    deadline = time.time() + 5
+    while time.time() < deadline and not _load_rows(path):
+        time.sleep(0.05)
+
+    assert len(_load_rows(path)) == 1
+    store.close()
+
+
+def test_close_flushes_and_is_idempotent(tmp_path):
+    """close() writes pending rows and can be called twice."""
+    path = str(tmp_path / "cache.db")
+    store = CacheStore(path)
+    store.add(b"key", "s", None, PAYLOAD)
+    store.close()
+    store.close()
+    store.flush()
+
+    assert len(_load_rows(path)) == 1
@@ -0,0 +1,46 @@
+"""
+Unit tests for the canonical prompt packing of retrieved context
+"""
+from rag_agent import _pack_prompt
+
+CONTEXT = [
+    {"id": "b", "content": "Second chunk"},
+    {"id": "a", "content": "First chunk"},
+]
+
+
+def test_no_context_returns_message_unchanged():
+    """Without retrieved chunks the query is sent as is."""
+    assert _pack_prompt("Bonjour !") == "Bonjour !"
+    assert _pack_prompt("Bonjour !", []) == "Bonjour !"
+
+
+def test_chunks_are_sorted_by_id_before_the_query():
+    """Chunks are emitted in id order, followed by the user query."""
+    prompt = _pack_prompt("Question?", CONTEXT)
+
+    assert prompt == (
+        "<docs>\n"
+        '<doc id="a">\nFirst chunk\n</doc>\n'
+        '<doc id="b">\nSecond chunk\n</doc>\n'
+        "</docs>\n"
+        "User: Question?")
+
+
+def test_prompt_does_not_depend_on_input_order():
+    """Any permutation of the same chunks packs to the same prompt."""
+    assert _pack_prompt("q", CONTEXT) == _pack_prompt("q", CONTEXT[::-1])
+
+
+def test_duplicate_ids_resolve_deterministically():
+    """For a repeated id the smallest content wins, whatever the order."""
+    duplicates = [
+        {"id": "a", "content": "version 2"},
+        {"id": "a", "content": "version 1"},
+    ]
+
+    prompt = _pack_prompt("q", duplicates)
+
+    assert prompt == _pack_prompt("q", duplicates[::-1])
+    assert prompt.count('<doc id="a">') == 1
+    assert "version 1" in prompt and "version 2" not in prompt
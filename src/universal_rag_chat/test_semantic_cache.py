@@ -0,0 +1,149 @@
+"""
+Unit tests for the semantic response cache (no Azure calls are made)
+"""
+import asyncio
+
+import httpx
+import numpy as np
+import pytest
+
+import semantic_cache
+from semantic_cache import SemanticCache
+
+
+def _unit(*values) -> np.ndarray:
+    vector = np.asarray(values, dtype=np.float32)
+    return vector / np.linalg.norm(vector)
+
+
+def _cache(capacity: int = 4, threshold: float = 0.05) -> SemanticCache:
+    # The HTTP client and credential are only used by _embed_texts
+    return SemanticCache("https://example.openai.azure.com", "embeddings",
+                         credential=None, http_client=object(),
+                         capacity=capacity, threshold=threshold)
+
+
+def test_lookup_hits_within_threshold():
+    """Only a match within the distance threshold is a hit."""
+    cache = _cache()
+    cache.store("model|", _unit(1, 0, 0), {"response": "hello"})
+
+    assert cache.lookup("model|", _unit(1, 0.1, 0)) == {"response": "hello"}
+    assert cache.lookup("model|", _unit(1, 1, 0)) is None
+
+
+def test_lookup_ignores_other_scopes():
+    """Entries stored under another scope never match."""
+    cache = _cache()
+    cache.store("model-a|", _unit(1, 0, 0), {"response": "a"})
+    cache.store("model-b|", _unit(1, 0.05, 0), {"response": "b"})
+
+    assert cache.lookup("model-a|", _unit(1, 0.05, 0)) == {"response": "a"}
+    assert cache.lookup("model-c|", _unit(1, 0, 0)) is None
+
+
+def test_lookup_on_empty_cache():
+    """An empty cache always misses."""
+    assert _cache().lookup("model|", _unit(1, 0, 0)) is None
+
+
+def test_store_evicts_least_recently_used():
+    """A full cache replaces its least recently used entry."""
+    cache = _cache(capacity=2)
+    cache.store("s", _unit(1, 0, 0), {"response": "a"})
+    cache.store("s", _unit(0, 1, 0), {"response": "b"})
+
+    # Touch "a" so "b" becomes the least recently used entry
+    assert cache.lookup("s", _unit(1, 0, 0)) == {"response": "a"}
+    cache.store("s", _unit(0, 0, 1), {"response": "c"})
+
+    assert cache.lookup("s", _unit(0, 1, 0)) is None
+    assert cache.lookup("s", _unit(1, 0, 0)) == {"response": "a"}
+    assert cache.lookup("s", _unit(0, 0, 1)) == {"response": "c"}
+
+
+def test_store_with_new_dimension_resets_cache():
+    """A new embedding dimension drops entries of the old one."""
+    cache = _cache()
+    cache.store("s", _unit(1, 0, 0), {"response": "old"})
+
+    # A vector of another dimension misses instead of raising
+    assert cache.lookup("s", _unit(1, 0, 0, 0, 0)) is None
+
+    cache.store("s", _unit(1, 0, 0, 0, 0), {"response": "new"})
+    assert cache.lookup("s", _unit(1, 0, 0, 0, 0)) == {"response": "new"}
+    assert cache.lookup("s", _unit(1, 0, 0)) is None
+
+
+def test_embed_coalesces_concurrent_calls(monkeypatch):
+    """Concurrent calls share requests of at most EMBED_BATCH_SIZE."""
+    cache = _cache()
+    batches = []
+
+    async def fake_embed_texts(texts):
+        batches.append(len(texts))
+        return np.stack([_unit(1, i + 1, 0) for i in range(len(texts))])
+
+    monkeypatch.setattr(cache, "_embed_texts", fake_embed_texts)
+    count = semantic_cache.EMBED_BATCH_SIZE + 8
+
+    async def embed_all():
+        return await asyncio.gather(
+            *(cache.embed(f"text {i}") for i in range(count)))
+
+    vectors = asyncio.run(embed_all())
+
+    assert batches == [semantic_cache.EMBED_BATCH_SIZE, 8]
+    # Each caller gets the vector at its own position in the batch
+    np.testing.assert_allclose(vectors[1], _unit(1, 2, 0))
+    np.testing.assert_allclose(vectors[-1], _unit(1, 8, 0))
+
+
+def test_embed_batch_error_reaches_every_caller(monkeypatch):
+    """A failed batch request raises in every waiting caller."""
+    cache = _cache()
+
+    async def failing_embed_texts(texts):
+        raise RuntimeError("embeddings unavailable")
+
+    monkeypatch.setattr(cache, "_embed_texts", failing_embed_texts)
+
+    async def embed_all():
+        return await asyncio.gather(
+            *(cache.embed(f"text {i}") for i in range(3)),
+            return_exceptions=True)
+
+    results = asyncio.run(embed_all())
+
+    assert len(results) == 3
+    for result in results:
+        assert isinstance(result, RuntimeError)
+
+    with pytest.raises(RuntimeError):
+        asyncio.run(cache.embed("again"))
+
+
+def test_embed_client_error_is_isolated_to_bad_input(monkeypatch):
+    """A 4xx on a batch is retried per item so only the bad input fails."""
+    cache = _cache()
+
+    async def picky_embed_texts(texts):
+        if "" in texts:
+            request = httpx.Request("POST", "https://example")
+            raise httpx.HTTPStatusError(
+                "bad request", request=request,
+                response=httpx.Response(400, request=request))
+        return np.stack([_unit(1, 0, 0) for _ in texts])
+
+    monkeypatch.setattr(cache, "_embed_texts", picky_embed_texts)
+
+    async def embed_all():
+        return await asyncio.gather(
+            cache.embed("good"), cache.embed(""), cache.embed("also good"),
+            return_exceptions=True)
+
+    good, bad, also_good = asyncio.run(embed_all())
+
+    np.testing.assert_allclose(good, _unit(1, 0, 0))
+    np.testing.assert_allclose(also_good, _unit(1, 0, 0))
+    assert isinstance(bad, httpx.HTTPStatusError)